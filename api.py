@@ -39,9 +39,6 @@ async def extract(file: UploadFile = File(...)):
         # 2) Run extracting_01 pipeline (returns body_doc, bundle)
         bundle = run_pipeline(vf.text, show_debug=False)
 
-        print(bundle)
-        print("passed here--------------------------------------------------------------------------------------------------------")
-
         return bundle
 
     except HTTPException:
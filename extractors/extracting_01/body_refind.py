@@ -5,30 +5,30 @@
 
 import re
 import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
 from typing import Dict, List, Tuple, Callable, Optional
 from spacy.tokens import Doc
 from .models import BodyItem
+from .textfold import FoldTable, strip_diacritics
 
 __all__ = ["build_body_via_sumario_spacy"]
 
 # -------------------- ALL-CAPS gate (for ORG / ORG_SECUNDARIA) --------------------
 
 _caps_token_rx = re.compile(r"[A-Za-zÀ-ÿ]")
+_blank_line_rx = re.compile(r"\n\s*\n")
+_caps_split_rx = re.compile(r"\s+")
 
 def _is_all_caps_token(tok: str) -> bool:
-    has_alpha = False
-    for ch in tok:
-        if ch.isalpha():
-            has_alpha = True
-            if ch != ch.upper():
-                return False
-    return has_alpha
+    # str.upper() / isalpha() run in C; no per-char Python loop
+    return tok == tok.upper() and any(map(str.isalpha, tok))
 
 def _passes_all_caps_gate(text: str) -> bool:
     # reject spans containing a blank line
-    if re.search(r"\n\s*\n", text):
+    if _blank_line_rx.search(text):
         return False
-    for tok in re.split(r"\s+", text.strip()):
+    for tok in _caps_split_rx.split(text.strip()):
         if _caps_token_rx.search(tok) and not _is_all_caps_token(tok):
             return False
     return True
@@ -37,11 +37,6 @@ def _passes_all_caps_gate(text: str) -> bool:
 
 _WHITESPACE_RX = re.compile(r"\s+")
 
-def _strip_diacritics(s: str) -> str:
-    # Convert to NFKD then drop combining marks
-    nk = unicodedata.normalize("NFKD", s)
-    return "".join(ch for ch in nk if not unicodedata.combining(ch))
-
 def _canonical_glyphs(s: str) -> str:
     # Map ordinal/degree glyphs to ASCII-ish (for matching only)
     # Also heal common OCR variants globally (safe for matching)
@@ -49,6 +44,9 @@ def _canonical_glyphs(s: str) -> str:
     s = s.replace("º", "o").replace("°", "o").replace("ª", "a")
     return s
 
+# glyph canonicalization + diacritic strip + lowercase, cached per char
+_FOLD = FoldTable(lambda ch: strip_diacritics(_canonical_glyphs(ch)).lower())
+
 def _heal_hyphen_linebreak_pairs(original: str, i: int) -> Tuple[bool, int]:
     """
     If we see a discretionary hyphen at EOL like '-\\n' or '-\\r\\n', signal to skip both
@@ -108,14 +106,8 @@ def _build_normalized_with_map(original: str) -> Tuple[str, List[int]]:
 
         prev_was_space = False
 
-        # Canonicalize glyphs
-        ch2 = _canonical_glyphs(ch)
-
-        # Strip diacritics
-        ch3 = _strip_diacritics(ch2)
-
-        # Lowercase
-        for out_ch in ch3.lower():
+        # Canonicalize glyphs, strip diacritics, lowercase (one cached lookup per char)
+        for out_ch in _FOLD[ord(ch)]:
             norm_chars.append(out_ch)
             idx_map.append(i)
 
@@ -166,9 +158,12 @@ def _normalize_phrase_for_regex(s: str) -> str:
       - NFKC -> glyph canonicalization -> strip diacritics -> lowercase -> collapse whitespace
     Then escape regex metachars and replace internal spaces with '\\s+'.
     """
-    s = unicodedata.normalize("NFKC", s)
-    s = _canonical_glyphs(s)
-    s = _strip_diacritics(s).lower()
+    if s.isascii():
+        # NFKC / glyph map / diacritic strip are all identities on ASCII
+        s = s.lower()
+    else:
+        # per-char fold table shared with the body pass (glyphs + diacritics + lowercase)
+        s = unicodedata.normalize("NFKC", s).translate(_FOLD)
     s = _WHITESPACE_RX.sub(" ", s).strip()
     # Escape regex meta chars
     parts = [re.escape(p) for p in s.split(" ") if p]
@@ -178,6 +173,12 @@ def _normalize_phrase_for_regex(s: str) -> str:
 
 # -------------------- Matching over normalized text --------------------
 
+@lru_cache(maxsize=4096)  # roster phrases (ORG names, DOC labels) recur across documents
+def _phrase_regex(phrase: str) -> Optional["re.Pattern[str]"]:
+    # normalized + compiled once per distinct phrase for the life of the process
+    pat = _normalize_phrase_for_regex(phrase)
+    return re.compile(pat) if pat else None
+
 def _gather_regex_candidates(
     norm_body: str,
     idx_map: List[int],
@@ -192,11 +193,10 @@ def _gather_regex_candidates(
     Returns: phrase -> list[(orig_start, orig_end)]
     """
     out: Dict[str, List[Tuple[int, int]]] = {}
-    for p in phrases:
-        pat = _normalize_phrase_for_regex(p)
-        if not pat:
+    for p in dict.fromkeys(phrases):  # repeated phrases (same DOC title under several ORGs) scan once
+        rx = _phrase_regex(p)
+        if rx is None:
             continue
-        rx = re.compile(pat)
         hits: List[Tuple[int, int]] = []
         for m in rx.finditer(norm_body):
             nst, nen = m.start(), m.end()
@@ -215,6 +215,18 @@ def _gather_regex_candidates(
             out[p] = hits
     return out
 
+def _first_hit_from(
+    hits: List[Tuple[int, int]],
+    starts: List[int],
+    lo: int,
+    hi: int,
+) -> Optional[Tuple[int, int]]:
+    """First hit with lo <= start < hi; `hits` is sorted by start and `starts` mirrors it."""
+    k = bisect_left(starts, lo)
+    if k < len(hits) and starts[k] < hi:
+        return hits[k]
+    return None
+
 # -------------------- Main --------------------
 
 def build_body_via_sumario_spacy(
@@ -267,16 +279,14 @@ def build_body_via_sumario_spacy(
         original_text=full_text,
     )
 
+    # Start offsets per phrase, aligned with the (start-sorted) hit lists, for bisecting
+    sub_hit_starts = {p: [st for st, _ in hits] for p, hits in sub_cands.items()}
+    doc_hit_starts = {p: [st for st, _ in hits] for p, hits in doc_cands.items()}
+
     # 4) Assign ORGs in roster order with a moving cursor (left-to-right, non-overlapping)
     assigned_orgs: List[Dict] = []
     cursor = 0
 
-    def next_org_start(i: int) -> int:
-        for j in range(i + 1, len(assigned_orgs)):
-            if assigned_orgs[j].get("assigned"):
-                return assigned_orgs[j]["assigned"][0]
-        return len(full_text)
-
     for b in blueprint:
         phrase = b["org_text"]
         cands = org_cands.get(phrase, [])
@@ -288,6 +298,15 @@ def build_body_via_sumario_spacy(
                 break
         assigned_orgs.append({**b, "assigned": chosen})
 
+    # Section boundaries: start of the next *assigned* ORG (or EOF), precomputed in one
+    # right-to-left sweep instead of rescanning the tail of assigned_orgs per section.
+    section_ends: List[int] = [len(full_text)] * len(assigned_orgs)
+    next_start = len(full_text)
+    for i in range(len(assigned_orgs) - 1, -1, -1):
+        section_ends[i] = next_start
+        if assigned_orgs[i]["assigned"]:
+            next_start = assigned_orgs[i]["assigned"][0]
+
     # 5) For each ORG section, assign SUBORGs and DOCs; slice sections using DOC anchors,
     #    or fall back to slicing by SUBORGs if no DOCs are present.
     body_items: List[BodyItem] = []
@@ -298,37 +317,32 @@ def build_body_via_sumario_spacy(
         if org_span is None:
             continue
         org_st, org_en = org_span
-        section_end = next_org_start(i)
+        section_end = section_ends[i]
+        org_display = " ".join(org_entry["org_text"].split())  # shared by every item of this section
 
         # SUBORGs (collect chosen hits for fallback slicing)
         sub_assignments: List[Tuple[int, int, str]] = []
         sub_cursor = org_st
         for sub in org_entry["suborgs"]:
             phrase = sub["text"]
-            hits = [h for h in sub_cands.get(phrase, []) if org_st <= h[0] < section_end]
-            chosen = None
-            for st, en in hits:
-                if st >= sub_cursor:
-                    chosen = (st, en, phrase)
-                    sub_cursor = en
-                    break
-            if chosen:
-                sub_assignments.append(chosen)
+            if phrase not in sub_cands:
+                continue
+            hit = _first_hit_from(sub_cands[phrase], sub_hit_starts[phrase], sub_cursor, section_end)
+            if hit:
+                sub_assignments.append((hit[0], hit[1], phrase))
+                sub_cursor = hit[1]
 
         # DOCs drive slicing (primary mode)
         doc_cursor = org_en
         doc_assignments: List[Tuple[int, int]] = []
         for d in org_entry["docs"]:
             phrase = d["text"]
-            hits = [h for h in doc_cands.get(phrase, []) if org_en <= h[0] < section_end]
-            chosen = None
-            for st, en in hits:
-                if st >= doc_cursor:
-                    chosen = (st, en)
-                    doc_cursor = en
-                    break
-            if chosen:
-                doc_assignments.append(chosen)
+            if phrase not in doc_cands:
+                continue
+            hit = _first_hit_from(doc_cands[phrase], doc_hit_starts[phrase], doc_cursor, section_end)
+            if hit:
+                doc_assignments.append(hit)
+                doc_cursor = hit[1]
 
         # Tiny safety net: if no DOCs found inside section, try a short look-back window
         if not doc_assignments:
@@ -348,7 +362,7 @@ def build_body_via_sumario_spacy(
                 for k, (sub_st, sub_en, sub_phrase) in enumerate(sub_assignments):
                     seg_end = sub_assignments[k + 1][0] if k + 1 < len(sub_assignments) else section_end
                     body_items.append(BodyItem(
-                        org_text=" ".join(org_entry["org_text"].split()),
+                        org_text=org_display,
                         org_start=org_st,
                         org_end=org_en,
                         section_id=org_st,
@@ -364,58 +378,24 @@ def build_body_via_sumario_spacy(
                     order_idx += 1
             continue  # move to next ORG
 
-        # Primary: slice by DOCs
-        first_doc_st, first_doc_en = doc_assignments[0]
-        first_end = (doc_assignments[1][0] if len(doc_assignments) >= 2 else section_end)
-        body_items.append(BodyItem(
-            org_text=" ".join(org_entry["org_text"].split()),
-            org_start=org_st,
-            org_end=org_en,
-            section_id=org_st,
-            doc_title=full_text[first_doc_st:first_doc_en],
-            doc_start=first_doc_st,
-            doc_end=first_doc_en,
-            relation="SECTION_ITEM",
-            slice_text=full_text[org_st:first_end].strip(),
-            slice_start=org_st,
-            slice_end=first_end,
-            order_index=order_idx,
-        ))
-        order_idx += 1
-
-        for j in range(1, len(doc_assignments) - 1):
-            cur_st, cur_en = doc_assignments[j]
-            nxt_st, _ = doc_assignments[j + 1]
-            body_items.append(BodyItem(
-                org_text=" ".join(org_entry["org_text"].split()),
-                org_start=org_st,
-                org_end=org_en,
-                section_id=org_st,
-                doc_title=full_text[cur_st:cur_en],
-                doc_start=cur_st,
-                doc_end=cur_en,
-                relation="SECTION_ITEM",
-                slice_text=full_text[cur_st:nxt_st].strip(),
-                slice_start=cur_st,
-                slice_end=nxt_st,
-                order_index=order_idx,
-            ))
-            order_idx += 1
-
-        if len(doc_assignments) >= 2:
-            last_st, last_en = doc_assignments[-1]
+        # Primary: slice by DOCs. The first slice opens at the ORG header, every other
+        # slice at its own DOC; each one closes where the next DOC starts (or at section end).
+        doc_starts = [st for st, _ in doc_assignments]
+        slice_starts = [org_st] + doc_starts[1:]
+        slice_ends = doc_starts[1:] + [section_end]
+        for (doc_st, doc_en), sl_st, sl_en in zip(doc_assignments, slice_starts, slice_ends):
             body_items.append(BodyItem(
-                org_text=" ".join(org_entry["org_text"].split()),
+                org_text=org_display,
                 org_start=org_st,
                 org_end=org_en,
                 section_id=org_st,
-                doc_title=full_text[last_st:last_en],
-                doc_start=last_st,
-                doc_end=last_en,
+                doc_title=full_text[doc_st:doc_en],
+                doc_start=doc_st,
+                doc_end=doc_en,
                 relation="SECTION_ITEM",
-                slice_text=full_text[last_st:section_end].strip(),
-                slice_start=last_st,
-                slice_end=section_end,
+                slice_text=full_text[sl_st:sl_en].strip(),
+                slice_start=sl_st,
+                slice_end=sl_en,
                 order_index=order_idx,
             ))
             order_idx += 1
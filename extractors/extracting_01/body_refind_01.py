@@ -1,37 +1,15 @@
-# body_refind.py
+# body_refind_01.py
 # spaCy-based re-anchoring using PhraseMatcher on the BODY-ONLY doc, no extra normalization
 
-import re
 from typing import Dict, List, Tuple
 import spacy
 from spacy.matcher import PhraseMatcher
 from spacy.tokens import Doc
 from .models import BodyItem
+from .body_refind import _passes_all_caps_gate  # shared ALL-CAPS gate (ORG / ORG_SECUNDARIA)
 
 __all__ = ["build_body_via_sumario_spacy"]
 
-# -------------------- ALL-CAPS gate (for ORG / ORG_SECUNDARIA) --------------------
-
-_caps_token_rx = re.compile(r"[A-Za-zÀ-ÿ]")
-
-def _is_all_caps_token(tok: str) -> bool:
-    has_alpha = False
-    for ch in tok:
-        if ch.isalpha():
-            has_alpha = True
-            if ch != ch.upper():
-                return False
-    return has_alpha
-
-def _passes_all_caps_gate(text: str) -> bool:
-    # reject spans containing a blank line
-    if re.search(r"\n\s*\n", text):
-        return False
-    for tok in re.split(r"\s+", text.strip()):
-        if _caps_token_rx.search(tok) and not _is_all_caps_token(tok):
-            return False
-    return True
-
 # -------------------- Main --------------------
 
 def build_body_via_sumario_spacy(doc: Doc, roster: Dict[str, object], pattern_tokenizer, include_local_details: bool = False) -> List[BodyItem]:
@@ -40,7 +18,8 @@ def build_body_via_sumario_spacy(doc: Doc, roster: Dict[str, object], pattern_to
     enforce ALL-CAPS for ORG/SUBORG, assign in roster order, and slice sections by DOC anchors.
     If no DOCs are found for an ORG, fall back to slicing by ORG_SECUNDARIA.
     
-    Patterns are tokenized with the SAME tokenizer that produced `doc` (pass `nlp` as `pattern_tokenizer`).
+    Patterns are tokenized with the SAME tokenizer that produced `doc` (pass `nlp` as `pattern_tokenizer`),
+    batched through `pattern_tokenizer.tokenizer.pipe`.
     """
     full_text = doc.text
 
@@ -57,8 +36,9 @@ def build_body_via_sumario_spacy(doc: Doc, roster: Dict[str, object], pattern_to
     # Prepare a PT tokenizer just to segment pattern strings,
     # then rebuild pattern Docs with the SAME vocab as the body doc.
     
-    def make_pat(text: str) -> Doc:
-        tmp = pattern_tokenizer.make_doc(text)
+    def as_pat(tmp: Doc) -> Doc:
+        if tmp.vocab is doc.vocab:
+            return tmp  # same vocab already: reuse the tokenized Doc as-is
         return Doc(doc.vocab, words=[t.text for t in tmp])
 
     # One PhraseMatcher, three groups
@@ -67,18 +47,22 @@ def build_body_via_sumario_spacy(doc: Doc, roster: Dict[str, object], pattern_to
         "ORG_SECUNDARIA": PhraseMatcher(doc.vocab, attr="LOWER"),
         "DOC": PhraseMatcher(doc.vocab, attr="LOWER"),
     }
-    key_to_phrase: Dict[str, str] = {}
+    key_to_phrase: Dict[int, str] = {}  # interned match_id hash -> phrase
 
     def add_phrases(label: str, phrases: List[str]) -> None:
         seen = set()
+        todo: List[Tuple[int, str]] = []
         for i, p in enumerate(phrases):
             if not p or p in seen:
                 continue
             seen.add(p)
-            pat_doc = make_pat(p)
+            todo.append((i, p))
+        # tokenize all patterns of this group in one streamed pass
+        pat_docs = pattern_tokenizer.tokenizer.pipe([p for _, p in todo])
+        for (i, p), tmp in zip(todo, pat_docs):
             key = f"{label}:{i}"
-            key_to_phrase[key] = p
-            matchers[label].add(key, [pat_doc])
+            key_to_phrase[doc.vocab.strings.add(key)] = p
+            matchers[label].add(key, [as_pat(tmp)])
 
     # Collect phrases from roster in Sumário order
     org_phrases = [b["org_text"] for b in blueprint]
@@ -93,8 +77,7 @@ def build_body_via_sumario_spacy(doc: Doc, roster: Dict[str, object], pattern_to
     def gather_candidates(label: str) -> Dict[str, List[Tuple[int, int]]]:
         out: Dict[str, List[Tuple[int, int]]] = {}
         for match_id, start, end in matchers[label](doc):
-            key = doc.vocab.strings[match_id]  # e.g., "ORG:0"
-            phrase = key_to_phrase.get(key, "")
+            phrase = key_to_phrase.get(match_id, "")  # match_id is the hash of e.g. "ORG:0"
             span = doc[start:end]
             if label in ("ORG", "ORG_SECUNDARIA") and not _passes_all_caps_gate(span.text):
                 continue
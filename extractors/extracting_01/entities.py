@@ -7,6 +7,7 @@ import spacy
 from spacy.tokens import Doc, Span
 
 from .relations import build_relations
+from .textfold import FoldTable, strip_diacritics
 
 
 # ---------------- Config ----------------
@@ -18,6 +19,8 @@ HEADER_STARTERS = {
     "PRESIDÊNCIA DO GOVERNO", "PRESIDENCIA DO GOVERNO", "APRAM"
 }
 
+_HEADER_STARTER_PREFIXES = tuple(HEADER_STARTERS)  # for one C-level str.startswith call
+
 # Function words to ignore when counting "content tokens"
 STOPWORDS_UP = {"DO", "DA", "DE", "DOS", "DAS", "E", "A", "O", "EM", "PARA", "COM", "NO", "NA", "NOS", "NAS"}
 
@@ -34,6 +37,15 @@ DOC_LABELS_SECTION = {
     "CONVERTIDO", "CESSAÇÃO","CESSACAO", "DELIBERAÇÃO", "DELIBERACAO"
 }
 
+# Labels that count as DOC when followed by a number marker ("DESPACHO n.º 59/2012")
+DOC_NUMBERED_PREFIXES = (
+    "DESPACHO", "DECLARAÇÃO", "DECLARACAO", "RETIFICAÇÃO", "RECTIFICAÇÃO", "AVISO", "AVISOS",
+    "EDITAL", "ANÚNCIO", "ANUNCIO", "REVOGAÇÃO", "REVOGACAO", "CONTRATO", "DECRETO",
+    "RESOLUÇÃO", "RESOLUCAO", "PORTARIA", "DELIBERAÇÃO", "DELIBERACAO",
+)
+# Any of "N.º", "Nº", "N°", "N.O" (upper-cased line), in one search
+RX_NUMBER_MARK = re.compile(r"N(?:\.[ºO]|[º°])")
+
 # Company-level doc anchor (used for look-ahead or simple detection)
 RX_CONTRATO_SOC = re.compile(r"(?is)\bcontrato\s*de\s*sociedade\b")
 
@@ -45,6 +57,8 @@ CONTINUATION_CONTENT_NOUNS = {
     "PLANO", "FINANÇAS", "FINANCAS", "EDUCAÇÃO", "EDUCACAO", "RECURSOS", "HUMANOS",
     "CULTURA", "TURISMO", "TRANSPORTES", "AMBIENTE", "ASSUNTOS", "SOCIAIS", "TRIBUNAL"
 }
+# Same nouns as one alternation: a single C-level pass instead of one substring scan per noun
+RX_CONTINUATION_NOUN = re.compile("|".join(map(re.escape, sorted(CONTINUATION_CONTENT_NOUNS))))
 
 
 # ---------------- Normalization & helpers ----------------
@@ -53,12 +67,17 @@ def has_lowercase_letter(line: str) -> bool:
     s = line.strip()
     return any(ch.isalpha() and ch.islower() for ch in s)
 
+# Post-NFKC cleanup in one translate pass: drop BOM / soft hyphen / zero-width space,
+# NBSP -> space, curly quotes -> straight, ellipsis -> "..."
+_NORMALIZE_TABLE = str.maketrans({
+    "\ufeff": None, "\u00ad": None, "\u200b": None,
+    "\u00a0": " ",
+    "“": "\"", "”": "\"", "’": "'", "…": "...",
+})
+
 def normalize_text(s: str) -> str:
     s = unicodedata.normalize("NFKC", s)
-    s = s.replace("\ufeff", "").replace("\u00ad", "").replace("\u200b", "")
-    s = s.replace("\u00a0", " ")
-    s = s.replace("“", "\"").replace("”", "\"").replace("’", "'").replace("…", "...")
-    return s
+    return s.translate(_NORMALIZE_TABLE)
 
 def line_offsets(text: str) -> List[Tuple[int, int, str]]:
     out, i = [], 0
@@ -70,27 +89,46 @@ def line_offsets(text: str) -> List[Tuple[int, int, str]]:
 def strip(line: str) -> str:
     return line.strip()
 
+_ASCII_FOLD = FoldTable(lambda ch: unicodedata.normalize("NFKD", ch).encode("ascii", "ignore").decode())
+
+def _ascii_fold(s: str) -> str:
+    # same result as NFKD + encode("ascii", "ignore"), one cached lookup per char
+    return s if s.isascii() else s.translate(_ASCII_FOLD)
+
+# Whitespace-delimited word with at least one letter-like char ([^\W\d_] also admits
+# non-decimal numerics such as "²", hence the isalpha re-check on the hit)
+_RX_WORD_WITH_LETTER = re.compile(r"\S*[^\W\d_]\S*")
+
 def first_alpha_word_upper(line: str) -> str:
-    for w in strip(line).split():
-        if any(ch.isalpha() for ch in w):
-            return unicodedata.normalize("NFKD", w).encode("ascii", "ignore").decode().upper().strip(",.;:-")
+    # scan lazily instead of split()-ing the whole line; usually the first word qualifies
+    for m in _RX_WORD_WITH_LETTER.finditer(line):
+        w = m.group()
+        if any(map(str.isalpha, w)):
+            return _ascii_fold(w).upper().strip(",.;:-")
     return ""
 
 def starts_with_header_starter(line: str) -> bool:
-    up = strip(line).upper()
+    return _starts_with_header_starter_up(strip(line).upper())
+
+def _starts_with_header_starter_up(up: str) -> bool:
+    # `up` is the already stripped + upper-cased line
     if not up:
         return False
     first = first_alpha_word_upper(up)
     if first in HEADER_STARTERS:
         return True
     # allow multiword starters at the very beginning (e.g., "PRESIDÊNCIA DO GOVERNO")
-    return any(up.startswith(s) for s in HEADER_STARTERS)
+    return up.startswith(_HEADER_STARTER_PREFIXES)
 
 def is_blank(line: str) -> bool:
-    return strip(line) == ""
+    # same as strip(line) == "" without building the stripped copy
+    return not line or line.isspace()
 
 def is_doc_label_line(line: str) -> bool:
-    up = strip(line).upper()
+    return _is_doc_label_up(strip(line).upper())
+
+def _is_doc_label_up(up: str) -> bool:
+    # `up` is the already stripped + upper-cased line
     if not up:
         return False
     head = " ".join(up.split())  # collapse spaces
@@ -98,17 +136,20 @@ def is_doc_label_line(line: str) -> bool:
     if head in DOC_LABELS_SECTION:
         return True
     # numbered forms like "DESPACHO n.º 59/2012"
-    if head.startswith(("DESPACHO", "DECLARAÇÃO", "DECLARACAO", "RETIFICAÇÃO", "RECTIFICAÇÃO", "AVISO", "AVISOS", "EDITAL", "ANÚNCIO", "ANUNCIO", "REVOGAÇÃO","REVOGACAO","CONTRATO","DECRETO", "RESOLUÇÃO", "RESOLUCAO", "PORTARIA", "DELIBERAÇÃO", "DELIBERACAO")):
-        if any(nm in head for nm in ("N.º", "Nº", "N°", "N.O", "N.O.")):
-            return True
+    if head.startswith(DOC_NUMBERED_PREFIXES) and RX_NUMBER_MARK.search(head):
+        return True
     # contrato de sociedade
-    if RX_CONTRATO_SOC.search(up):
+    if _has_contrato_soc(up):
         return True
     return False
 
+def _has_contrato_soc(up: str) -> bool:
+    # literal precheck on the upper-cased line; the regex only runs when it can match
+    return "CONTRATO" in up and RX_CONTRATO_SOC.search(up) is not None
+
 def content_token_count(line: str) -> int:
     toks = [t for t in strip(line).split() if any(ch.isalpha() for ch in t)]
-    toks_up = [unicodedata.normalize("NFKD", t).encode("ascii", "ignore").decode().upper().strip(",.;:") for t in toks]
+    toks_up = [_ascii_fold(t).upper().strip(",.;:") for t in toks]
     return sum(1 for t in toks_up if t not in STOPWORDS_UP)
 
 def is_header_continuation(prev_line: str, curr_line: str) -> bool:
@@ -131,7 +172,7 @@ def is_header_continuation(prev_line: str, curr_line: str) -> bool:
 
     # domain nouns after a stopword (e.g., "DO PLANO E FINANÇAS", "E DOS ASSUNTOS SOCIAIS")
     if parts and parts[0] in STOPWORDS_UP:
-        if any(noun in curr_up for noun in CONTINUATION_CONTENT_NOUNS):
+        if RX_CONTINUATION_NOUN.search(curr_up):
             return True
 
     return False
@@ -153,8 +194,7 @@ def is_all_caps_line(line: str) -> bool:
     s = strip(line)
     if not s:
         return False
-    base = unicodedata.normalize("NFKD", s)
-    base = "".join(ch for ch in base if not unicodedata.combining(ch))
+    base = strip_diacritics(s)
     letters = [ch for ch in base if ch.isalpha()]
     if not letters:
         return False
@@ -172,6 +212,15 @@ def detect_entities(doc: Doc) -> List[Span]:
     """State machine over lines to produce ORG, ORG_SECUNDARIA, DOC spans with robust boundaries."""
     spans: List[Span] = []
     lines = line_offsets(doc.text)
+    n_lines = len(lines)
+
+    # Per-line flags, computed once: the state machine and its look-aheads revisit lines.
+    # strip().upper() is done once per line and shared by the predicates.
+    ups = [strip(ln).upper() for _, _, ln in lines]
+    blank = [not up for up in ups]
+    lower = [has_lowercase_letter(ln) for _, _, ln in lines]
+    starter = [_starts_with_header_starter_up(up) for up in ups]
+    doc_label = [_is_doc_label_up(up) for up in ups]
 
     i = 0
     state = "OUTSIDE"
@@ -187,21 +236,21 @@ def detect_entities(doc: Doc) -> List[Span]:
                 spans.append(sp)
         header_start = header_end = None
 
-    while i < len(lines):
+    while i < n_lines:
         start, end, ln = lines[i]
         if state == "OUTSIDE":
-            if is_blank(ln):
+            if blank[i]:
                 i += 1
                 continue
-            if starts_with_header_starter(ln) and not has_lowercase_letter(ln):
+            if not lower[i] and starter[i]:
                 # start header and absorb continuations (up to cap)
                 header_start, header_end = start, end
                 header_lines = 1
                 j = i + 1
                 prev_ln = ln
-                while j < len(lines) and header_lines < max_header_lines:
+                while j < n_lines and header_lines < max_header_lines:
                     _, end_j, ln_j = lines[j]
-                    if is_blank(ln_j) or is_doc_label_line(ln_j) or starts_with_header_starter(ln_j):
+                    if blank[j] or doc_label[j] or starter[j]:
                         break
                     if is_header_continuation(prev_ln, ln_j):
                         header_end = end_j
@@ -223,15 +272,15 @@ def detect_entities(doc: Doc) -> List[Span]:
                 continue
 
         # IN_SECTION
-        if starts_with_header_starter(ln) and not is_blank(ln) and not has_lowercase_letter(ln):
+        if not blank[i] and not lower[i] and starter[i]:
             # new header
             header_start, header_end = start, end
             header_lines = 1
             j = i + 1
             prev_ln = ln
-            while j < len(lines) and header_lines < max_header_lines:
+            while j < n_lines and header_lines < max_header_lines:
                 _, end_j, ln_j = lines[j]
-                if is_blank(ln_j) or is_doc_label_line(ln_j) or starts_with_header_starter(ln_j) or has_lowercase_letter(ln_j):
+                if blank[j] or lower[j] or doc_label[j] or starter[j]:
                     break
                 if is_header_continuation(prev_ln, ln_j):
                     header_end = end_j
@@ -245,7 +294,7 @@ def detect_entities(doc: Doc) -> List[Span]:
             state = "IN_SECTION"
             continue
 
-        if is_doc_label_line(ln):
+        if doc_label[i]:
             sp = char_span(doc, start, end, "DOC")
             if sp:
                 spans.append(sp)
@@ -254,19 +303,19 @@ def detect_entities(doc: Doc) -> List[Span]:
 
         # Decide ORG_SECUNDARIA
         promote_secondary = False
-        if not is_blank(ln) and not has_lowercase_letter(ln):
-            if content_token_count(ln) >= 4 and not starts_with_header_starter(ln):
+        if not blank[i] and not lower[i]:
+            if content_token_count(ln) >= 4 and not starter[i]:
                 promote_secondary = True
             else:
                 # look-ahead for "Contrato de sociedade" within 2 lines
                 j = i + 1
                 steps = 0
-                while steps < 2 and j < len(lines):
-                    la_line = strip(lines[j][2]).upper()
-                    if RX_CONTRATO_SOC.search(la_line):
+                while steps < 2 and j < n_lines:
+                    la_line = ups[j]
+                    if _has_contrato_soc(la_line):
                         promote_secondary = True
                         break
-                    if starts_with_header_starter(la_line) or is_doc_label_line(la_line):
+                    if starter[j] or doc_label[j]:
                         break
                     steps += 1
                     j += 1
@@ -276,9 +325,9 @@ def detect_entities(doc: Doc) -> List[Span]:
             block_start, block_end = start, end
             j = i + 1
             consumed = 0
-            while consumed < 2 and j < len(lines):
+            while consumed < 2 and j < n_lines:
                 _, end_j, ln_j = lines[j]
-                if is_blank(ln_j) or starts_with_header_starter(ln_j) or is_doc_label_line(ln_j) or has_lowercase_letter(ln_j):
+                if blank[j] or lower[j] or starter[j] or doc_label[j]:
                     break
                 block_end = end_j
                 j += 1
@@ -293,7 +342,21 @@ def detect_entities(doc: Doc) -> List[Span]:
         # plain text
         i += 1
 
-    # --- NEW: dedupe exact spans, then resolve overlaps (keep longest) ---
+    return _resolve_spans(spans)
+
+
+def _resolve_spans(spans: List[Span]) -> List[Span]:
+    """Dedupe exact spans, then resolve overlaps (keep longest), as spacy.util.filter_spans.
+    The line scan above emits spans in order and without overlaps, so one linear check
+    usually proves there is nothing to resolve and the sort inside filter_spans is skipped."""
+    prev_end = 0
+    for sp in spans:
+        if sp.start < prev_end or sp.end <= sp.start:
+            break
+        prev_end = sp.end
+    else:
+        return list(spans)  # already what filter_spans would return
+
     seen = set()
     uniq = []
     for sp in spans:
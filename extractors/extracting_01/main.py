@@ -1,4 +1,6 @@
 import json
+from functools import lru_cache
+
 import spacy
 
 from .entities import normalize_text, detect_entities, print_output
@@ -8,6 +10,14 @@ from . import segmenter
 from .body_refind import build_body_via_sumario_spacy
 
 
+PIPE_EXCLUDE = ["tok2vec", "morphologizer", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "ner"]
+
+@lru_cache(maxsize=1)
+def _load_nlp():
+    """Tokenizer-only pipeline, loaded once per process and reused across calls."""
+    # exclude, not disable: disabled components are still loaded
+    return spacy.load("pt_core_news_lg", exclude=PIPE_EXCLUDE)
+
 def run_pipeline(raw_text: str, show_debug: bool = False):
     """
       1) Sumário + roster + body_text (segmenter)
@@ -22,7 +32,7 @@ def run_pipeline(raw_text: str, show_debug: bool = False):
     """
     # 0) Normalize + tokenizer-only pipeline
     full_text = normalize_text(raw_text)
-    nlp = spacy.load("pt_core_news_lg", disable=["ner", "tagger", "parser", "lemmatizer"])
+    nlp = _load_nlp()
     full_doc = nlp.make_doc(full_text)
 
     # 1) Entities (rule-based) + relations (rule-based)
@@ -31,29 +41,41 @@ def run_pipeline(raw_text: str, show_debug: bool = False):
 
     # 2) Sumário + roster + body text
     sumario, roster, body_text, _file_relations = segmenter.build_sumario_and_body(
-        full_doc, include_local_details=False
+        full_doc, include_local_details=False, show_debug=show_debug
     )
 
     # 3) Body-only doc + re-anchoring into slices
-    body_doc = nlp.make_doc(body_text)
+    body_doc = _body_doc_from_full(nlp, full_doc, roster["cut_index"], body_text)
     body_items = build_body_via_sumario_spacy(body_doc, roster, nlp, include_local_details=False)
 
     if show_debug:
         print_output(full_doc)
     #Build the bundle here and return it
-    bundle = _preview_bundle(sumario, roster, body_items, full_text, body_text)
+    bundle = _preview_bundle(sumario, roster, body_items, full_text, body_text, show_debug=show_debug)
 
-    print("body_items: >>>>>>>>>>>>>>>>>>>>>>>>>>>>>", body_items)
-    print("roster: >>>>>>>>>>>>>>>>>>>>>>>>>>>>>", roster)
-    print("body_doc:>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>", body_doc)
-    print("body_text:>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>", body_text)
+    if show_debug:
+        print("body_items: >>>>>>>>>>>>>>>>>>>>>>>>>>>>>", body_items)
+        print("roster: >>>>>>>>>>>>>>>>>>>>>>>>>>>>>", roster)
+        print("body_doc:>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>", body_doc)
+        print("body_text:>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>", body_text)
 
     return bundle
 
 
-def _preview_bundle(sumario, roster, body_items, full_text: str, body_text: str):
+def _body_doc_from_full(nlp, full_doc, cut: int, body_text: str):
+    """
+    Reuse the tokens of `full_doc` from `cut` onwards instead of re-tokenizing the body.
+    The cut sits on an ORG start (a token boundary); if it ever doesn't, fall back to make_doc.
+    """
+    span = full_doc.char_span(cut, len(full_doc.text)) if body_text else None
+    if span is None or span.text != body_text:
+        return nlp.make_doc(body_text)
+    return span.as_doc()
+
+
+def _preview_bundle(sumario, roster, body_items, full_text: str, body_text: str, show_debug: bool = False):
     """
-    Build and print a JSON bundle (no assembler.py).
+    Build a JSON bundle (no assembler.py); print it only when `show_debug` is set.
     Includes:
       - sumario (text/ents/relations + relations' head/tail text)
       - roster
@@ -160,7 +182,8 @@ def _preview_bundle(sumario, roster, body_items, full_text: str, body_text: str)
         "body_raw": body_text,
     }
 
-    print(json.dumps(bundle, ensure_ascii=False, indent=2))
+    if show_debug:
+        print(json.dumps(bundle, ensure_ascii=False, indent=2))
     return bundle
 
 
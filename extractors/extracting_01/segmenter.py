@@ -3,14 +3,16 @@ from typing import List, Dict, Tuple, Optional
 from spacy.tokens import Doc, Span
 from .models import Sumario
 
-import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from .textfold import strip_diacritics
 
 # -------- helpers --------
 
 # ADD near helpers
 def _norm_org_tokens(s: str) -> List[str]:
     # collapse ws, strip diacritics, uppercase, then split to tokens
-    return _strip_diacritics(_collapse_ws(s)).upper().strip(",.;:").split()
+    return _norm_org(s).split()
 
 def _is_token_prefix(a: List[str], b: List[str], min_shared: int = 5) -> bool:
     """
@@ -24,10 +26,6 @@ def _is_token_prefix(a: List[str], b: List[str], min_shared: int = 5) -> bool:
         return False
     return a[:m] == b[:m]
 
-
-def _strip_diacritics(s: str) -> str:
-    return "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch))
-
 def _coalesce_split_orgs(roster_orgs: List[Dict[str, object]]) -> List[Dict[str, object]]:
     """
     If an ORG has exactly one SUBORG and there exists a later ORG whose org_text equals
@@ -43,6 +41,9 @@ def _coalesce_split_orgs(roster_orgs: List[Dict[str, object]]) -> List[Dict[str,
     def norm_key(s: str) -> str:
         return _norm_org(s)  # collapse ws, upper, strip trailing ,.;:
 
+    # normalized org keys, computed once and kept aligned with roster_orgs below
+    keys = [norm_key(o.get("org_text","")) for o in roster_orgs]
+
     i = 0
     while i < len(roster_orgs):
         cur = roster_orgs[i]
@@ -55,7 +56,7 @@ def _coalesce_split_orgs(roster_orgs: List[Dict[str, object]]) -> List[Dict[str,
             j = i + 1
             found = -1
             while j < len(roster_orgs):
-                if norm_key(roster_orgs[j].get("org_text","")) == key_combined:
+                if keys[j] == key_combined:
                     found = j
                     break
                 j += 1
@@ -64,18 +65,17 @@ def _coalesce_split_orgs(roster_orgs: List[Dict[str, object]]) -> List[Dict[str,
                 # merge docs (dedupe, preserve order: earlier first)
                 docs_i = cur.get("doc_texts") or []
                 docs_j = roster_orgs[found].get("doc_texts") or []
-                merged_docs = []
-                for t in docs_i + docs_j:
-                    if t and t not in merged_docs:
-                        merged_docs.append(t)
+                merged_docs = [t for t in dict.fromkeys(docs_i + docs_j) if t]
 
                 # mutate earlier entry
                 cur["org_text"] = combined
                 cur["suborg_texts"] = []
                 cur["doc_texts"] = merged_docs
+                keys[i] = key_combined
 
                 # drop the later duplicate entry
                 del roster_orgs[found]
+                del keys[found]
                 # do not advance i; there might be more to coalesce relative to this slot
                 continue
         i += 1
@@ -124,16 +124,18 @@ def _merge_orphan_orgs(roster_orgs: List[Dict[str, object]]) -> List[Dict[str, o
     return merged
 
 
+@lru_cache(maxsize=4096)  # the same ORG headers recur in Sumário, body and roster keys
 def _norm_org(s: str) -> str:
-    return _strip_diacritics(_collapse_ws(s)).upper().strip(",.;:")
+    return strip_diacritics(_collapse_ws(s)).upper().strip(",.;:")
 
-def _filter_ents_in_span(doc: Doc, a: int, b: int) -> Dict[str, List[Tuple[int, int, str, str]]]:
+def _filter_ents_in_span(doc: Doc, a: int, b: int, ents: Optional[List[Span]] = None) -> Dict[str, List[Tuple[int, int, str, str]]]:
+    # `ents` (if given) must come from _ents_in_order(doc); results are then already in order
+    ents = _ents_in_order(doc) if ents is None else ents
+    starts = [e.start_char for e in ents]
     out: Dict[str, List[Tuple[int, int, str, str]]] = {"ORG": [], "DOC": [], "ORG_SECUNDARIA": []}
-    for e in doc.ents:
-        if a <= e.start_char and e.end_char <= b and e.label_ in out:
+    for e in ents[bisect_left(starts, a):bisect_left(starts, b)]:
+        if e.end_char <= b and e.label_ in out:
             out[e.label_].append((e.start_char, e.end_char, e.label_, e.text))
-    for k in out:
-        out[k].sort(key=lambda t: (t[0], -t[1]))
     return out
 
 def _filter_relations_in_span(doc: Doc, a: int, b: int) -> List[dict]:
@@ -146,27 +148,33 @@ def _filter_relations_in_span(doc: Doc, a: int, b: int) -> List[dict]:
             rels.append(r)
     return rels
 
-def _find_body_start_with_first_repeated_org(doc: Doc) -> int:
+def _find_body_start_with_first_repeated_org(doc: Doc, ents: Optional[List[Span]] = None) -> int:
     """
     Second occurrence of an ORG marks the body start, where 'occurrence' allows
     an ORG later to be the earlier ORG plus appended tokens (e.g., ORG + SUBORG),
     matched accent-insensitively and with whitespace/punctuation normalized.
     """
-    seen_tokens: List[Tuple[List[str], int]] = []
-    for e in _ents_in_order(doc):
+    # Previously seen ORGs bucketed by their first `min_shared` tokens: a repeat must share
+    # that whole head, so only the matching bucket needs the full prefix check.
+    min_shared = 5
+    seen_by_head: Dict[Tuple[str, ...], List[List[str]]] = {}
+    for e in (_ents_in_order(doc) if ents is None else ents):
         if e.label_ != "ORG":
             continue
         cur = _norm_org_tokens(e.text)
-        # check against all previously seen ORGs
-        for prev_tokens, _ in seen_tokens:
+        if len(cur) < min_shared:
+            continue  # too short to ever be (or match) a repeat
+        head = tuple(cur[:min_shared])
+        bucket = seen_by_head.setdefault(head, [])
+        for prev_tokens in bucket:
             # treat as repeat if one is a prefix of the other with sufficient overlap
-            if _is_token_prefix(cur, prev_tokens) or _is_token_prefix(prev_tokens, cur):
+            if _is_token_prefix(cur, prev_tokens, min_shared):
                 return e.start_char
-        seen_tokens.append((cur, e.start_char))
+        bucket.append(cur)
     return len(doc.text)
 
 # -------- main API --------
-def build_sumario_and_body(doc: Doc, include_local_details: bool = False) -> Tuple[Sumario, Dict[str, object], str, List[dict]]:
+def build_sumario_and_body(doc: Doc, include_local_details: bool = False, show_debug: bool = False) -> Tuple[Sumario, Dict[str, object], str, List[dict]]:
     """
     Returns:
       - sumario: Sumário block (text + ents + relations) for [0:cut)
@@ -178,11 +186,11 @@ def build_sumario_and_body(doc: Doc, include_local_details: bool = False) -> Tup
       - file_relations: ALL relations found in the whole file (doc._.relations), unfiltered
     """
     # --- Sumário (unchanged) ---
-    ents = _ents_in_order(doc)
-    cut = _find_body_start_with_first_repeated_org(doc)
+    ents = _ents_in_order(doc)  # sorted once, shared by the cut search and the Sumário filter
+    cut = _find_body_start_with_first_repeated_org(doc, ents)
 
     sum_text = doc.text[:cut]
-    sum_ents = _filter_ents_in_span(doc, 0, cut)
+    sum_ents = _filter_ents_in_span(doc, 0, cut, ents)
     sum_rels = _filter_relations_in_span(doc, 0, cut)
     sumario = Sumario(text=sum_text, ents=sum_ents, relations=sum_rels)
 
@@ -206,16 +214,12 @@ def build_sumario_and_body(doc: Doc, include_local_details: bool = False) -> Tup
         elif rel == "SECTION_ITEM":
             org_to_doc.setdefault((hs, he), []).append((ts, te))
 
-    for k in org_to_sub:
-        org_to_sub[k].sort(key=lambda p: p[0])
-    for k in org_to_doc:
-        org_to_doc[k].sort(key=lambda p: p[0])
-
-    # ORG occurrences in Sumário order (use offsets only for sorting; not returned)
-    orgs_ordered = sorted(sum_ents.get("ORG", []), key=lambda t: (t[0], -t[1]))
+    # No re-sorting needed: build_relations walks ents in (start, -end) order, so tails
+    # per ORG are appended in text order, and sum_ents lists come out of
+    # _filter_ents_in_span already ordered.
 
     roster_orgs: List[Dict[str, object]] = []
-    for st, en, _, org_text in orgs_ordered:
+    for st, en, _, org_text in sum_ents.get("ORG", []):
         key = (st, en)
         sub_texts = [
             ent_text_by_offsets.get((ts, te, "ORG_SECUNDARIA"), "")
@@ -239,7 +243,8 @@ def build_sumario_and_body(doc: Doc, include_local_details: bool = False) -> Tup
     roster: Dict[str, object] = {"cut_index": cut_index, "orgs": roster_orgs}
     body_text = doc.text[cut_index:]
 
-    print("segmenter.py.body_text:<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<", body_text)
+    if show_debug:
+        print("segmenter.py.body_text:<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<", body_text)
     # full, unfiltered relations from the entire document (Sumário + Body)
     file_relations: List[dict] = list(getattr(doc._, "relations", []))
     return sumario, roster, body_text, file_relations
@@ -0,0 +1,24 @@
+# textfold.py
+# Per-character fold tables shared by the extracting_01 modules.
+
+import unicodedata
+from typing import Callable
+
+class FoldTable(dict):
+    """codepoint -> fold(char), filled lazily; usable with str.translate or indexed by ord()."""
+    def __init__(self, fold: Callable[[str], str]):
+        super().__init__()
+        self._fold = fold
+
+    def __missing__(self, cp: int) -> str:
+        out = self[cp] = self._fold(chr(cp))
+        return out
+
+def _nfkd_without_marks(ch: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c))
+
+_NO_MARKS = FoldTable(_nfkd_without_marks)
+
+def strip_diacritics(s: str) -> str:
+    """NFKD minus combining marks. Per char == whole string: NFKD only reorders marks."""
+    return s if s.isascii() else s.translate(_NO_MARKS)
@@ -3,17 +3,21 @@ import re
 import sys
 import unicodedata
 import spacy
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from operator import attrgetter
 from typing import List, Dict, Tuple, Optional
-from spacy.matcher import PhraseMatcher
 from spacy.tokens import Span
-from spacy.util import filter_spans
 
 # -----------------------------------------------------------------------------
 # Pipeline: tokenizer-only (fast; avoids built-in NER conflicts)
 # -----------------------------------------------------------------------------
-nlp = spacy.load("pt_core_news_lg", disable=["ner", "tagger", "parser", "lemmatizer"])
+# same list as extracting_01/main.py (this module also runs standalone, so it can't import it)
+PIPE_EXCLUDE = ["tok2vec", "morphologizer", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "ner"]
+nlp = spacy.load("pt_core_news_lg", exclude=PIPE_EXCLUDE)
 
 # -----------------------------------------------------------------------------
 # ORG header starters (ALL-CAPS, can span multiple lines)
@@ -91,9 +95,20 @@ TAXONOMY: List[Node] = L1_NODES + L2_NODES + L3_NODES
 DOT_LEADER_LINE_RE = re.compile(r'^\s*\.{5,}\s*$')   # line that is only dots
 DOT_LEADER_TAIL_RE = re.compile(r'\.{5,}\s*$')       # dots at end of the line
 BLANK_RE = re.compile(r'^\s*$')
+WS_RE = re.compile(r'\s+')
+PERIOD_END_RE = re.compile(r'\.\s*$')               # line ends in a single period
+_FIRST_WORD_RE = re.compile(r'[^\s\-–—:,;./]*')      # first word, for header starters
+_ITEM_NEWLINE_RE = re.compile(r'\s*\n\s*')
+_NON_ALNUM_RE = re.compile(r'[^A-Z0-9]+')
 
 ITEM_STARTERS = ("portaria", "aviso", "acordo", "contrato", "cct", "cctv", "regulamento", "despacho")
 
+def _line_starts(lines: List[str], base: int = 0) -> List[int]:
+    """Absolute start offset of each keepends line (C-level prefix sum over the lengths)."""
+    starts = list(accumulate(map(len, lines), initial=base))
+    starts.pop()  # drop the end-of-text total
+    return starts
+
 def _looks_like_item_start(ln: str) -> bool:
     """Heuristic: line begins a new Sumário item."""
     raw = ln.strip()
@@ -111,63 +126,86 @@ def _looks_like_item_start(ln: str) -> bool:
 
     return starts_itemish and (has_dash_early or starts_with_keyword)
 
+# Portuguese (and common Latin-1) accented letters -> ASCII base, as NFD + drop-Mn would give
+_DIACRITIC_TABLE = str.maketrans(
+    "áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ",
+    "aaaaaeeeeiiiiooooouuuucnAAAAAEEEEIIIIOOOOOUUUUCN",
+)
+# combining diacritical mark blocks (what NFD splits Latin accents into)
+_MN_RE = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]')
+
+@lru_cache(maxsize=65536)  # same heading / ORG surfaces recur across scan, parse and linking
 def _strip_diacritics(s: str) -> str:
-    return "".join(ch for ch in unicodedata.normalize("NFD", s) if unicodedata.category(ch) != "Mn")
+    out = s.translate(_DIACRITIC_TABLE)
+    if out.isascii():
+        return out
+    # anything outside the table (other scripts, stray combining marks): generic NFD path
+    return _MN_RE.sub("", unicodedata.normalize("NFD", out))
 
+@lru_cache(maxsize=65536)
 def _normalize_heading_text(s: str) -> str:
     # lower, strip diacritics, remove trailing colon/spaces, compress spaces
     s = s.strip()
     s = s[:-1] if s.endswith(":") else s
     s = _strip_diacritics(s).lower()
-    s = re.sub(r'\s+', ' ', s)
+    s = WS_RE.sub(' ', s)
     return s
 
 def _normalize_aliases(aliases: List[str]) -> List[str]:
-    out = set()
-    for a in aliases:
-        variants = {a, a[:-1] if a.endswith(":") else a}
-        for v in variants:
-            out.add(_normalize_heading_text(v))
+    # _normalize_heading_text already drops a trailing colon, so "X" and "X:" share one key
+    out = {_normalize_heading_text(a) for a in aliases}
     return sorted(out, key=len, reverse=True)  # longer first
 
 def _is_all_caps_line(ln: str) -> bool:
     t = ln.strip()
-    if not t:
-        return False
-    letters = [ch for ch in t if ch.isalpha()]
-    if not letters:
-        return False
-    return all(ch == ch.upper() for ch in letters)
+    # no lowercase anywhere (one C-level upper()) and at least one letter
+    return t == t.upper() and any(map(str.isalpha, t))
 
 def _starts_with_starter(ln: str) -> bool:
     t = ln.strip()
     if not t:
         return False
-    first = re.split(r'[\s\-–—:,;./]+', t, 1)[0]
+    # leading run up to the first separator (== re.split(..., 1)[0], without building a list)
+    first = _FIRST_WORD_RE.match(t).group()
     return first.upper() in HEADER_STARTERS
 
 def clean_item_text(raw: str) -> str:
-    raw = raw.replace("-\n", "").replace("­\n", "")
-    raw = re.sub(r'\s*\n\s*', ' ', raw).strip()
-    raw = re.sub(r'\.*\s*$', '', raw).strip()
-    return raw
-
-def _dedup_spans(spans: List[Span]) -> List[Span]:
-    seen = set()
-    out = []
-    for s in spans:
-        key = (s.start, s.end, s.label_)
-        if key in seen:
+    if "\n" in raw:  # single-line items need no de-hyphenation / joining
+        raw = raw.replace("-\n", "").replace("­\n", "")
+        raw = _ITEM_NEWLINE_RE.sub(' ', raw)
+    # drop trailing dot leaders (rstrip == the old r'\.*\s*$' sub once outer spaces are gone)
+    return raw.strip().rstrip(".").strip()
+
+def _resolve_spans(spans: List[Span]) -> List[Span]:
+    """spacy.util.filter_spans semantics (longest first, then earliest; no shared tokens),
+    sorted by start, with repeated empty spans dropped too (filter_spans keeps those).
+    Covered tokens live in a bytearray indexed by token + 1, so an empty span at 0 checks slot 0."""
+    if not spans:
+        return []
+    covered = bytearray(len(spans[0].doc) + 2)
+    seen_empty = set()
+    kept = []
+    for sp in sorted(spans, key=lambda sp: (sp.end - sp.start, -sp.start), reverse=True):
+        start, end = sp.start, sp.end
+        if covered[start + 1] or covered[end]:
             continue
-        seen.add(key)
-        out.append(s)
-    return out
+        if end > start:
+            covered[start + 1:end + 1] = b"\x01" * (end - start)
+        else:
+            key = (start, sp.label_)
+            if key in seen_empty:
+                continue
+            seen_empty.add(key)
+        kept.append(sp)
+    kept.sort(key=attrgetter("start"))
+    return kept
 
+@lru_cache(maxsize=4096)  # the same ORG surfaces repeat across Sumário and body
 def canonical_org_key(s: str) -> str:
     """Uppercase, strip diacritics, drop all non-alphanumerics.
     This collapses 'S E C R E T A R I A' and 'Direcção/Dir e c c ã o' to stable keys."""
     t = _strip_diacritics(s).upper()
-    return re.sub(r'[^A-Z0-9]+', '', t)
+    return _NON_ALNUM_RE.sub('', t)
 
 _SUMARIO_PAT = re.compile(r'\bS[UÚ]M[ÁA]RIO\b', re.IGNORECASE)
 
@@ -175,48 +213,66 @@ def find_sumario_anchor(text: str) -> Optional[int]:
     m = _SUMARIO_PAT.search(text)
     return m.start() if m else None
 
+# All L1 aliases in one alternation: the leftmost match is the earliest alias hit.
+# Trailing colons are dropped: wherever "X:" matches, the bare "X" matches at the same start.
+_L1_ALIAS_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        re.escape(a)
+        for a in sorted({a.rstrip(":") for node in L1_NODES for a in node.aliases}, key=len, reverse=True)
+    ) + r')\b',
+    re.IGNORECASE,
+)
+
 def find_first_l1_heading_after(text: str, start_pos: int) -> Optional[int]:
     """Light hint for 'body' start if no ORG is found right away."""
     # Use your L1 taxonomy aliases (accent/colon tolerant)
-    aliases = []
-    for node in L1_NODES:
-        aliases.extend(node.aliases)
-    pats = [re.compile(r'\b' + re.escape(a).replace(r'\:', r':?') + r'\b', re.IGNORECASE) for a in set(aliases)]
-    best = None
-    for pat in pats:
-        m = pat.search(text, pos=start_pos)
-        if m:
-            if best is None or m.start() < best:
-                best = m.start()
-    return best
+    m = _L1_ALIAS_RE.search(text, start_pos)
+    return m.start() if m else None
 
 
-def split_sumario_body(text: str, org_spans_fulltext: List[Span]) -> Tuple[Tuple[int,int], Tuple[int,int]]:
+def split_sumario_body(text: str, org_spans_fulltext: List[Span]) -> Tuple[Tuple[int,int], Tuple[int,int], str]:
+    """Returns (sumario_span, body_span, strategy); strategy names the rule that chose the cut."""
     S = find_sumario_anchor(text)  # may be None
 
     # 1) Try the 'second ORG' rule
     body_start = _choose_body_start_by_second_org(org_spans_fulltext, text, S)
+    strategy = "second_org_pair"
 
     # 2) Fallbacks
     if body_start is None:
+        strategy = "fallback_first_l1_or_window"
         # OLD (problematic): body_start = find_first_l1_heading_after(text, S or 0)
         # NEW (safe): keep the whole rest as Sumário so headings are included
         body_start = len(text)
 
     # 3) Sumário starts at anchor if present; else from start
     sum_start = S if S is not None else 0
-    return (sum_start, body_start), (body_start, len(text))
+    return (sum_start, body_start), (body_start, len(text)), strategy
 
 
+def _spans_starting_in(spans, starts: List[int], start: int, end: int):
+    """Yield spans with start <= start_char <= end; `spans` is sorted by start_char and `starts` mirrors it."""
+    i = bisect_left(starts, start)
+    n = len(spans)
+    while i < n and spans[i].start_char <= end:
+        yield spans[i]
+        i += 1
 
-def collect_org_hits_in_span(doc, text: str, span: Tuple[int,int], source: str) -> List[dict]:
+def collect_org_hits_in_span(doc, text: str, span: Tuple[int,int], source: str,
+                             ents: Optional[List[Span]] = None,
+                             starts: Optional[List[int]] = None) -> List[dict]:
     """Filter already-found ORG spans to this [start,end) and return originals + canonical keys."""
+    # for several slices of one doc, pass ents=list(doc.ents) and their start_chars once
     start, end = span
     hits = []
-    for sp in doc.ents:
+    if ents is None:
+        ents = list(doc.ents)
+    if starts is None:
+        starts = [sp.start_char for sp in ents]
+    for sp in _spans_starting_in(ents, starts, start, end):
         if sp.label_ != "ORG":
             continue
-        if sp.start_char >= start and sp.end_char <= end:
+        if sp.end_char <= end:
             hits.append({
                 "source": source,  # "sumario" or "body"
                 "surface_raw": text[sp.start_char:sp.end_char],
@@ -229,7 +285,7 @@ def collect_org_hits_in_span(doc, text: str, span: Tuple[int,int], source: str)
 def link_orgs(sumario_hits: List[dict], body_hits: List[dict]) -> Tuple[List[dict], dict]:
     """Return (relations, diagnostics). Greedy 1–1 pairing by first seen per canonical key."""
     # Index body hits by canonical key, preserve order
-    body_by_key: Dict[str, List[dict]] = defaultdict(list)
+    body_by_key: Dict[str, deque] = defaultdict(deque)
     for h in body_hits:
         body_by_key[h["canonical_key"]].append(h)
 
@@ -237,9 +293,9 @@ def link_orgs(sumario_hits: List[dict], body_hits: List[dict]) -> Tuple[List[dic
     unmatched_sumario = []
     for h in sumario_hits:
         key = h["canonical_key"]
-        lst = body_by_key.get(key, [])
+        lst = body_by_key.get(key)
         if lst:
-            b = lst.pop(0)  # greedy 1–1
+            b = lst.popleft()  # greedy 1–1
             relations.append({
                 "key": key,
                 "sumario": {"surface_raw": h["surface_raw"], "span": h["span"]},
@@ -265,26 +321,20 @@ def _choose_body_start_by_second_org(org_spans_fulltext: List[Span],
     Returns the earliest start_char among all 'second occurrences' of any ORG canonical key.
     If sumario_anchor is given, only consider pairs where the 2nd occurrence is after the anchor.
     """
-    from collections import defaultdict
-
-    # Build ordered occurrences per canonical key
-    occ_by_key = defaultdict(list)  # key -> [start_char, ...] sorted
+    # Walk ORGs in text order; the first 2nd occurrence past the anchor is the earliest one.
+    # Only a key's 2nd occurrence counts (3rd+ are ignored, as before).
+    seen_once, seen_twice = set(), set()
     for sp in sorted(org_spans_fulltext, key=lambda s: s.start_char):
-        surf = text[sp.start_char:sp.end_char]
-        key = canonical_org_key(surf)
-        occ_by_key[key].append(sp.start_char)
-
-    # Gather candidate 2nd-occurrence starts (optionally filtered by anchor)
-    candidates = []
-    for key, starts in occ_by_key.items():
-        if len(starts) >= 2:
-            second = starts[1]
-            if sumario_anchor is None or second > sumario_anchor:
-                candidates.append(second)
-
-    if not candidates:
-        return None
-    return min(candidates)
+        key = canonical_org_key(text[sp.start_char:sp.end_char])
+        if key in seen_twice:
+            continue
+        if key not in seen_once:
+            seen_once.add(key)
+            continue
+        seen_twice.add(key)
+        if sumario_anchor is None or sp.start_char > sumario_anchor:
+            return sp.start_char
+    return None
 
 
 def _build_sumario_struct_from_tree(sections_tree, offset: int, sumario_len: int):
@@ -331,11 +381,14 @@ def _build_sumario_struct_from_tree(sections_tree, offset: int, sumario_len: int
 
     # 3) section_ranges (heading → content range inside sumário)
     #    Order by heading start; content ends at next heading start (or sumário end)
-    sections_sorted = sorted(sections, key=lambda x: x["span"]["start"])
+    #    (starts pulled out once; sort indices by a flat list instead of nested dict lookups)
+    heading_starts = [s["span"]["start"] for s in sections]
+    order = sorted(range(len(sections)), key=heading_starts.__getitem__)
+    next_starts = [heading_starts[k] for k in order[1:]] + [offset + sumario_len]
     section_ranges = []
-    for i, s in enumerate(sections_sorted):
+    for k, next_start in zip(order, next_starts):
+        s = sections[k]
         heading_end = s["span"]["end"]
-        next_start = sections_sorted[i + 1]["span"]["start"] if i + 1 < len(sections_sorted) else (offset + sumario_len)
         section_ranges.append({
             "section_key": s["path"][-1],
             "section_path": s["path"],
@@ -347,11 +400,12 @@ def _build_sumario_struct_from_tree(sections_tree, offset: int, sumario_len: int
     return sections, relations_section_item, section_ranges
 
 # --- slice-aware ORG collector from spans list ---------------------------
-def _collect_org_hits_from_spans(org_spans, text: str, span_range, source: str):
+def _collect_org_hits_from_spans(org_spans, org_starts: List[int], text: str, span_range, source: str):
+    # org_starts mirrors org_spans (sorted by start_char); built once per text by the caller
     start, end = span_range
     hits = []
-    for sp in org_spans:
-        if sp.start_char >= start and sp.end_char <= end:
+    for sp in _spans_starting_in(org_spans, org_starts, start, end):
+        if sp.end_char <= end:
             surf = text[sp.start_char:sp.end_char]
             hits.append({
                 "source": source,  # "sumario" or "body"
@@ -367,16 +421,34 @@ def _collect_org_hits_from_spans(org_spans, text: str, span_range, source: str):
 
 
 # -----------------------------------------------------------------------------
-# Build a matcher over ALL aliases (we'll use alias_to_nodes in a line scanner)
+# Alias table over ALL headings (used by the line scanner)
 # -----------------------------------------------------------------------------
-def build_heading_matcher(nlp) -> Tuple[PhraseMatcher, Dict[str, List[Node]]]:
+def _build_alias_table(nodes: List[Node]) -> Dict[str, List[Node]]:
     alias_to_nodes: Dict[str, List[Node]] = defaultdict(list)
-    for node in TAXONOMY:
+    canonicals_per_alias: Dict[str, set] = defaultdict(set)
+    for node in nodes:
         for norm_alias in _normalize_aliases(node.aliases):
             # prevent duplicate nodes per normalized alias (by canonical)
-            if node.canonical not in {n.canonical for n in alias_to_nodes[norm_alias]}:
+            seen = canonicals_per_alias[norm_alias]
+            if node.canonical not in seen:
+                seen.add(node.canonical)
                 alias_to_nodes[norm_alias].append(node)
-    return PhraseMatcher(nlp.vocab), alias_to_nodes
+    return dict(alias_to_nodes)  # plain dict: lookups must not insert keys
+
+# The taxonomy is static: normalize it once at import and share the table
+_ALIAS_TO_NODES: Dict[str, List[Node]] = _build_alias_table(TAXONOMY)
+# Per alias, candidates in resolution order (deeper level first, then longer canonical);
+# static, so sorted once here instead of per heading hit in parse()
+_ALIAS_TO_RANKED_NODES: Dict[str, List[Node]] = {
+    norm: sorted(nodes, key=lambda n: (-n.level, -len(_normalize_heading_text(n.canonical))))
+    for norm, nodes in _ALIAS_TO_NODES.items()
+}
+_HEADING_FIRST_CHARS = frozenset(a[:1] for a in _ALIAS_TO_NODES)
+
+@lru_cache(maxsize=None)
+def _heading_first_char(ch: str) -> str:
+    """A line's first char as heading normalization sees it ('' if a lone mark vanishes)."""
+    return _strip_diacritics(ch).lower()[:1]
 
 # -----------------------------------------------------------------------------
 # Heading detection via line scanning (allows diacritic-insensitive matching)
@@ -390,21 +462,72 @@ class HeadingHit:
     end_char: int
 
 def scan_headings(text: str, alias_to_nodes: Dict[str, List[Node]]) -> List[HeadingHit]:
+    return _scan_lines(text, alias_to_nodes)[0]
+
+# -----------------------------------------------------------------------------
+# ORG detector (multi-line ALL-CAPS that starts with a starter token)
+# -----------------------------------------------------------------------------
+@dataclass
+class OrgRec:
+    """Character-level ORG span; enough for splitting and linking (no Doc needed)."""
+    start_char: int
+    end_char: int
+
+_WS_RUN_RE = re.compile(r'\s*')
+
+def _expand_to_ws_tokens(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Widen [start, end) like doc.char_span(..., alignment_mode="expand") would.
+    Only edges inside whitespace can move: the tokenizer keeps each whitespace run as one
+    token, except a single leading ' ', which is the previous token's trailing space."""
+    if start < len(text) and text[start].isspace():
+        i = start
+        while i > 0 and text[i - 1].isspace():
+            i -= 1
+        start = i + 1 if i > 0 and text[i] == " " else i
+    if 0 < end < len(text) and text[end - 1].isspace():
+        end = _WS_RUN_RE.match(text, end).end()
+    elif end == len(text) and end >= 2 and text[end - 1] == " " and not text[end - 2].isspace():
+        end -= 1  # a lone trailing space at EOF is the last token's whitespace_, not a token
+    return start, end
+
+def find_org_char_spans(text: str) -> List[OrgRec]:
+    """ORG blocks with the offsets find_org_spans would give them (whitespace tokens included)."""
+    return [OrgRec(*_expand_to_ws_tokens(text, r.start_char, r.end_char)) for r in _scan_lines(text, None)[1]]
+
+def _scan_lines(text: str, alias_to_nodes: Optional[Dict[str, List[Node]]]) -> Tuple[List[HeadingHit], List[OrgRec]]:
+    """One sweep over the lines: heading hits (skipped if alias_to_nodes is None) and ORG blocks."""
     lines = text.splitlines(keepends=True)
     # absolute starts for each line
-    line_starts = []
-    pos = 0
-    for ln in lines:
-        line_starts.append(pos)
-        pos += len(ln)
+    line_starts = _line_starts(lines)
 
+    # alias_to_nodes holds each canonical at most once per alias, and each line is
+    # looked up once, so (start_char, end_char, canonical) can't repeat: no seen-set needed
     hits: List[HeadingHit] = []
-    seen_hits = set()  # (start_char, end_char, canonical)
+    org_recs: List[OrgRec] = []
+    org_start = None  # line index of the open ORG block, if any
+    # first chars of the aliases in *this* table, for a quick skip before full normalization
+    if alias_to_nodes is None or alias_to_nodes is _ALIAS_TO_NODES:
+        first_chars = _HEADING_FIRST_CHARS
+    else:
+        first_chars = frozenset(a[:1] for a in alias_to_nodes)
 
     for i, ln in enumerate(lines):
+        # ORG: a starter line in ALL-CAPS opens a block; following ALL-CAPS lines extend it
+        caps = _is_all_caps_line(ln)
+        if org_start is not None and not caps:
+            org_recs.append(OrgRec(line_starts[org_start], line_starts[i - 1] + len(lines[i - 1])))
+            org_start = None
+        elif org_start is None and caps and _starts_with_starter(ln):
+            org_start = i
+
+        if alias_to_nodes is None:
+            continue
         surface = ln.strip()
         if not surface:
             continue
+        first = _heading_first_char(surface[0])
+        if first and first not in first_chars:  # a lone mark vanishes: can't tell, don't skip
+            continue
         norm = _normalize_heading_text(surface)
         if not norm:
             continue
@@ -414,10 +537,6 @@ def scan_headings(text: str, alias_to_nodes: Dict[str, List[Node]]) -> List[Head
         start_char = line_starts[i]
         end_char = line_starts[i] + len(lines[i])
         for node in nodes:
-            key = (start_char, end_char, node.canonical)
-            if key in seen_hits:
-                continue
-            seen_hits.add(key)
             hits.append(HeadingHit(
                 node.canonical,
                 surface if surface.endswith(":") else surface + ":",
@@ -425,38 +544,24 @@ def scan_headings(text: str, alias_to_nodes: Dict[str, List[Node]]) -> List[Head
                 start_char,
                 end_char
             ))
-    return hits
 
-# -----------------------------------------------------------------------------
-# ORG detector (multi-line ALL-CAPS that starts with a starter token)
-# -----------------------------------------------------------------------------
-def find_org_spans(doc, text: str) -> List[Span]:
-    org_spans = []
-    lines = text.splitlines(keepends=True)
-    line_starts = []
-    pos = 0
-    for ln in lines:
-        line_starts.append(pos)
-        pos += len(ln)
+    if org_start is not None:
+        org_recs.append(OrgRec(line_starts[org_start], line_starts[-1] + len(lines[-1])))
+    return hits, org_recs
 
-    i = 0
-    while i < len(lines):
-        if _starts_with_starter(lines[i]) and _is_all_caps_line(lines[i]):
-            start_i = i
-            j = i + 1
-            while j < len(lines) and _is_all_caps_line(lines[j]):
-                j += 1
-            start_char = line_starts[start_i]
-            end_char = line_starts[j - 1] + len(lines[j - 1])
-            chspan = doc.char_span(start_char, end_char, alignment_mode="expand")
-            if chspan is not None:
-                org_spans.append(Span(doc, chspan.start, chspan.end, label="ORG"))
-            i = j
-        else:
-            i += 1
+def find_org_spans(doc, text: str, org_recs: Optional[List[OrgRec]] = None) -> List[Span]:
+    """Same ORG blocks as find_org_char_spans, snapped to `doc` tokens as labelled Spans."""
+    if org_recs is None:
+        org_recs = find_org_char_spans(text)
+    org_spans = []
+    for rec in org_recs:
+        # char_span labels directly; no intermediate unlabelled Span to rebuild
+        chspan = doc.char_span(rec.start_char, rec.end_char, label="ORG", alignment_mode="expand")
+        if chspan is not None:
+            org_spans.append(chspan)
     return org_spans
 
-def find_item_char_spans(full_text: str, start_char: int, end_char: int, next_heading_starts: set):
+def find_item_char_spans(full_text: str, start_char: int, end_char: int, next_heading_start: Optional[int]):
     """Yield (start_char, end_char) for items within [start_char, end_char).
        Item ends when:
          1) line is only dot leaders,
@@ -468,31 +573,33 @@ def find_item_char_spans(full_text: str, start_char: int, end_char: int, next_he
     seg_lines = segment.splitlines(keepends=True)
 
     # absolute offsets for each line
-    offs = []
-    p = start_char
-    for ln in seg_lines:
-        offs.append(p)
-        p += len(ln)
+    offs = _line_starts(seg_lines, start_char)
+    # blank-line flags, computed once (the trimming loops below revisit lines)
+    blank = [ln.isspace() for ln in seg_lines]
+    n = len(seg_lines)
 
     block_start = 0
     for i, ln in enumerate(seg_lines):
+        # Cases 1 and 2 both need a 5-dot run: a substring test skips both regexes on plain lines
+        has_leader = "....." in ln
+
         # Case 1: pure dots line → close previous block
-        if DOT_LEADER_LINE_RE.match(ln):
+        if has_leader and DOT_LEADER_LINE_RE.match(ln):
             s = block_start
             e = i
-            while s < e and BLANK_RE.match(seg_lines[s]): s += 1
+            while s < e and blank[s]: s += 1
             j = e - 1
-            while j >= s and BLANK_RE.match(seg_lines[j]): j -= 1
+            while j >= s and blank[j]: j -= 1
             if j >= s:
                 yield offs[s], offs[j] + len(seg_lines[j])
             block_start = i + 1
             continue
 
         # Case 2: trailing dot leaders on the same line
-        m = DOT_LEADER_TAIL_RE.search(ln)
+        m = DOT_LEADER_TAIL_RE.search(ln) if has_leader else None
         if m:
             s = block_start
-            while s <= i and BLANK_RE.match(seg_lines[s]): s += 1
+            while s <= i and blank[s]: s += 1
             if s <= i:
                 end_char_abs = offs[i] + m.start()
                 yield offs[s], end_char_abs
@@ -501,13 +608,13 @@ def find_item_char_spans(full_text: str, start_char: int, end_char: int, next_he
 
         # Case 2b: single-period end IF next non-blank looks like a new item
         # guard with min length to avoid splitting abbreviations
-        if re.search(r'\.\s*$', ln) and len(ln.strip()) >= 40:
+        if PERIOD_END_RE.search(ln) and len(ln.strip()) >= 40:
             k = i + 1
-            while k < len(seg_lines) and BLANK_RE.match(seg_lines[k]):
+            while k < n and blank[k]:
                 k += 1
-            if k < len(seg_lines) and _looks_like_item_start(seg_lines[k]):
+            if k < n and _looks_like_item_start(seg_lines[k]):
                 s = block_start
-                while s <= i and BLANK_RE.match(seg_lines[s]): s += 1
+                while s <= i and blank[s]: s += 1
                 if s <= i:
                     # include the final period of current line
                     end_char_abs = offs[i] + len(seg_lines[i].rstrip("\n"))
@@ -516,24 +623,23 @@ def find_item_char_spans(full_text: str, start_char: int, end_char: int, next_he
                 continue
 
         # Case 3: fallback — if next line starts a heading, close before it
-        next_line_start = offs[i + 1] if i + 1 < len(seg_lines) else None
-        if next_line_start is not None and next_line_start in next_heading_starts:
+        if i + 1 < n and offs[i + 1] == next_heading_start:
             s = block_start
             e = i
-            while s < e and BLANK_RE.match(seg_lines[s]): s += 1
+            while s < e and blank[s]: s += 1
             j = e
-            while j >= s and BLANK_RE.match(seg_lines[j]): j -= 1
+            while j >= s and blank[j]: j -= 1
             if j >= s:
                 yield offs[s], offs[j] + len(seg_lines[j])
             block_start = i + 1
             # --- FINAL FLUSH: if there's an open block at the end of the segment, emit it
-    if block_start < len(seg_lines):
+    if block_start < n:
         s = block_start
-        e = len(seg_lines) - 1
+        e = n - 1
         # skip leading/trailing blanks inside the remaining block
-        while s <= e and BLANK_RE.match(seg_lines[s]):
+        while s <= e and blank[s]:
             s += 1
-        while e >= s and BLANK_RE.match(seg_lines[e]):
+        while e >= s and blank[e]:
             e -= 1
         if s <= e:
             yield offs[s], offs[e] + len(seg_lines[e])
@@ -548,11 +654,20 @@ def parse(text: str, nlp):
       doc           : spaCy Doc with entities (ORG, section leaf spans, items)
       sections_tree : list of dicts with {path, surface, span, items}
     """
-    doc = nlp(text)
-    _, alias_to_nodes = build_heading_matcher(nlp)
+    return parse_from_doc(nlp(text))
 
-    # 1) Find all heading line hits (may include ambiguous aliases)
-    hits = scan_headings(text, alias_to_nodes)
+def parse_many(texts, nlp, batch_size: int = 64, n_process: int = 1):
+    """Yield (doc, sections_tree) per text; nlp.pipe owns tokenization and batching."""
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield parse_from_doc(doc)
+
+def parse_from_doc(doc):
+    """Same as parse(), on an already tokenized Doc (its entities are replaced)."""
+    text = doc.text
+    alias_to_nodes = _ALIAS_TO_NODES
+
+    # 1) Find all heading line hits (may include ambiguous aliases); ORG blocks come from the same pass
+    hits, org_recs = _scan_lines(text, alias_to_nodes)
     hits.sort(key=lambda h: h.start_char)
 
     # 2) Resolve ambiguity contextually using a stack (parents)
@@ -595,7 +710,7 @@ def parse(text: str, nlp):
         chosen: Optional[Node] = None
         current_parent = stack[-1][0] if stack else None
 
-        for node in sorted(candidates, key=lambda n: (-n.level, -len(_normalize_heading_text(n.canonical)))):
+        for node in _ALIAS_TO_RANKED_NODES.get(norm, ()):
             if allowed_by_parents(node, current_parent):
                 chosen = node
                 break
@@ -620,50 +735,50 @@ def parse(text: str, nlp):
     close_leaf_if_any(len(text))
 
     # 3) Build entity spans: ORG + section leaf spans (canonical labels)
-    org_spans = find_org_spans(doc, text)
+    org_spans = find_org_spans(doc, text, org_recs)
 
     heading_leaf_spans: List[Span] = []
     for leaf in leaves:
         start = leaf["span"]["start"]
         end   = leaf["span"]["end"]
-        ch = doc.char_span(start, end, alignment_mode="expand")
+        label = leaf["path"][-1]  # canonical leaf label
+        ch = doc.char_span(start, end, label=label, alignment_mode="expand")
         if ch is None:
             continue
-        label = leaf["path"][-1]  # canonical leaf label
-        heading_leaf_spans.append(Span(doc, ch.start, ch.end, label=label))
+        heading_leaf_spans.append(ch)
 
     # 4) Extract items inside each leaf’s text_range (dot leaders / single '.' / next heading)
-    heading_starts = {l["span"]["start"] for l in leaves}
+    # each leaf only needs the first heading start after its text begins
+    heading_starts = sorted({l["span"]["start"] for l in leaves})
 
     item_spans: List[Span] = []
     for leaf in leaves:
         sc, ec = leaf["text_range"]
-        for s_char, e_char in find_item_char_spans(text, sc, ec, heading_starts):
-            ch = doc.char_span(s_char, e_char, alignment_mode="expand")
+        item_label = f"Item{leaf['path'][-1]}"
+        k = bisect_right(heading_starts, sc)
+        next_heading_start = heading_starts[k] if k < len(heading_starts) else None
+        for s_char, e_char in find_item_char_spans(text, sc, ec, next_heading_start):
+            ch = doc.char_span(s_char, e_char, label=item_label, alignment_mode="expand")
             if ch is None:
                 continue
-            item_spans.append(Span(doc, ch.start, ch.end, label=f"Item{leaf['path'][-1]}"))
+            item_spans.append(ch)
 
     # 5) Finalize doc.ents without overlaps or duplicates
     all_spans = org_spans + heading_leaf_spans + item_spans
-    all_spans = _dedup_spans(all_spans)   # remove exact duplicates first
-    all_spans = filter_spans(all_spans)   # resolve overlaps
-    doc.ents = tuple(_dedup_spans(all_spans))
+    doc.ents = tuple(_resolve_spans(all_spans))
 
     # 6) Build a clean sections_tree with items (dedup items per leaf)
     sections_tree: List[Dict] = []
     items_per_leaf: Dict[int, List[Dict]] = defaultdict(list)
-    seen_item_spans_per_leaf: Dict[int, set] = defaultdict(set)
+    # doc.ents are sorted and non-overlapping, so item spans are unique and bisectable per leaf
+    item_ents = [sp for sp in doc.ents if sp.label_.startswith("Item")]
+    item_starts = [sp.start_char for sp in item_ents]
 
     for leaf in leaves:
         sc, ec = leaf["text_range"]
         lid = id(leaf)
-        for sp in doc.ents:
-            if sp.label_.startswith("Item") and sc <= sp.start_char and sp.end_char <= ec:
-                key = (sp.start_char, sp.end_char)
-                if key in seen_item_spans_per_leaf[lid]:
-                    continue
-                seen_item_spans_per_leaf[lid].add(key)
+        for sp in _spans_starting_in(item_ents, item_starts, sc, ec):
+            if sp.end_char <= ec:
                 items_per_leaf[lid].append({
                     "text": clean_item_text(sp.text),
                     "span": {"start": sp.start_char, "end": sp.end_char}
@@ -686,12 +801,12 @@ def parse_sumario_and_body_bundle(text_raw: str, nlp):
     Returns: (payload_dict, sumario_text, body_text, text_raw)
     The payload contains sumário structure, section→item relations, ORG↔ORG links, diagnostics, and raw slices.
     """
-    # A) ORG scan over the full text (for split + linking)
-    doc_full = nlp(text_raw)
-    org_spans_full = find_org_spans(doc_full, text_raw)  # existing function
+    # A) ORG scan over the full text (for split + linking); line-based, no tokenization
+    org_spans_full = find_org_char_spans(text_raw)
+    org_starts_full = [rec.start_char for rec in org_spans_full]  # shared by both slice collectors
 
-    # B) Split by SECOND-ORG rule (with fallbacks already inside)
-    sum_span, body_span = split_sumario_body(text_raw, org_spans_full)
+    # B) Split by SECOND-ORG rule (with fallbacks already inside); also reports which rule won
+    sum_span, body_span, strategy = split_sumario_body(text_raw, org_spans_full)
     sum_start, sum_end = sum_span
     body_start, body_end = body_span
 
@@ -707,14 +822,10 @@ def parse_sumario_and_body_bundle(text_raw: str, nlp):
     )
 
     # E) ORG hits per slice + ORG↔ORG linking
-    sum_orgs  = _collect_org_hits_from_spans(org_spans_full, text_raw, sum_span, source="sumario")
-    body_orgs = _collect_org_hits_from_spans(org_spans_full, text_raw, body_span, source="body")
+    sum_orgs  = _collect_org_hits_from_spans(org_spans_full, org_starts_full, text_raw, sum_span, source="sumario")
+    body_orgs = _collect_org_hits_from_spans(org_spans_full, org_starts_full, text_raw, body_span, source="body")
     relations, diag = link_orgs(sum_orgs, body_orgs)  # existing helper
 
-    # F) Diagnostics: how split was chosen
-    second_org_pos = _choose_body_start_by_second_org(org_spans_full, text_raw, find_sumario_anchor(text_raw))
-    strategy = "second_org_pair" if (second_org_pos == body_start) else "fallback_first_l1_or_window"
-
     payload = {
         "version": "sumario_body_linker@1.0.0",
         "text_raw": text_raw,
@@ -811,6 +922,60 @@ def print_results(doc, sections_tree):
         print(f"{ent.label_:<20} @{ent.start_char:>5}-{ent.end_char:<5} | {repr(ent.text)}")
 
 
+def format_bundle_summary(payload: dict) -> List[str]:
+    """Console summary of a bundle payload (split, sections, relations, diagnostics), one entry per line."""
+    sum_span = payload["sumario"]["span"]
+    body_span = payload["body"]["span"]
+    out = [
+        "\n=== SPLIT ===",
+        f"Sumário: {sum_span['start']}..{sum_span['end']} | len={sum_span['end']-sum_span['start']}",
+        f"Body   : {body_span['start']}..{body_span['end']} | len={body_span['end']-body_span['start']}",
+        f"Strategy: {payload['diagnostics']['strategy']}",
+    ]
+
+    # Sections & items
+    out.append("\n=== SUMÁRIO SECTIONS ===")
+    for s in payload["sumario"]["sections"]:
+        path = " > ".join(s["path"])
+        out.append(f"- {path}  @ {s['span']['start']}..{s['span']['end']}")
+        for it in s["items"]:
+            out.append(f"    • {it['text']}  @ {it['span']['start']}..{it['span']['end']}")
+
+    # Section → Item relations
+    out.append("\n=== SUMÁRIO RELATIONS (Section → Item) ===")
+    for r in payload["sumario"]["relations_section_item"]:
+        out.append(f"{' > '.join(r['section_path'])}  ::  {r['item_text']}")
+
+    # Section ranges (useful for downstream segmentation)
+    out.append("\n=== SUMÁRIO SECTION RANGES ===")
+    for sr in payload["sumario"]["section_ranges"]:
+        out.append(f"{' > '.join(sr['section_path'])}  ::  content {sr['content_range']['start']}..{sr['content_range']['end']}")
+
+    # ORG → ORG relations
+    out.append("\n=== ORG → ORG RELATIONS ===")
+    for r in payload["relations_org_to_org"]:
+        out.append(f"- {r['key']}")
+        out.append(f"  sumário: '{r['sumario']['surface_raw']}' @{r['sumario']['span']['start']}..{r['sumario']['span']['end']}")
+        out.append(f"  body   : '{r['body']['surface_raw']}' @{r['body']['span']['start']}..{r['body']['span']['end']}")
+        out.append(f"  conf   : {r['confidence']}")
+
+    # Diagnostics
+    diag = payload["diagnostics"]
+    if diag.get("split_anchor") or diag.get("unmatched_sumario_orgs") or diag.get("unmatched_body_orgs"):
+        out.append("\n=== DIAGNOSTICS ===")
+        if diag.get("split_anchor"):
+            out.append(f"Split anchor: {diag['split_anchor']}")
+        if diag.get("unmatched_sumario_orgs"):
+            out.append("Unmatched Sumário ORGs:")
+            for h in diag["unmatched_sumario_orgs"]:
+                out.append(f"  - '{h['surface_raw']}' @{h['span']['start']}..{h['span']['end']} | key={h['canonical_key']}")
+        if diag.get("unmatched_body_orgs"):
+            out.append("Unmatched Body ORGs:")
+            for h in diag["unmatched_body_orgs"]:
+                out.append(f"  - '{h['surface_raw']}' @{h['span']['start']}..{h['span']['end']} | key={h['canonical_key']}")
+    return out
+
+
 # -----------------------------------------------------------------------------
 # CLI / quick test
 # -----------------------------------------------------------------------------
@@ -965,57 +1130,5 @@ SECRETARIAREGIONAL DOS RECURSOS HUMANOS
     # --- Run pipeline on the first sample ---
     payload, sumario_text, body_text, full_text = parse_sumario_and_body_bundle(_text_01, nlp)
 
-    sum_span = payload["sumario"]["span"]
-    body_span = payload["body"]["span"]
-    print("\n=== SPLIT ===")
-    print(f"Sumário: {sum_span['start']}..{sum_span['end']} | len={sum_span['end']-sum_span['start']}")
-    print(f"Body   : {body_span['start']}..{body_span['end']} | len={body_span['end']-body_span['start']}")
-    print(f"Strategy: {payload['diagnostics']['strategy']}")
-
-    # Sections & items
-    print("\n=== SUMÁRIO SECTIONS ===")
-    for s in payload["sumario"]["sections"]:
-        path = " > ".join(s["path"])
-        print(f"- {path}  @ {s['span']['start']}..{s['span']['end']}")
-        for it in s["items"]:
-            print(f"    • {it['text']}  @ {it['span']['start']}..{it['span']['end']}")
-
-    # Section → Item relations
-    print("\n=== SUMÁRIO RELATIONS (Section → Item) ===")
-    for r in payload["sumario"]["relations_section_item"]:
-        print(f"{' > '.join(r['section_path'])}  ::  {r['item_text']}")
-
-    # Section ranges (useful for downstream segmentation)
-    print("\n=== SUMÁRIO SECTION RANGES ===")
-    for sr in payload["sumario"]["section_ranges"]:
-        print(f"{' > '.join(sr['section_path'])}  ::  content {sr['content_range']['start']}..{sr['content_range']['end']}")
-
-    # ORG → ORG relations
-    print("\n=== ORG → ORG RELATIONS ===")
-    for r in payload["relations_org_to_org"]:
-        print(f"- {r['key']}")
-        print(f"  sumário: '{r['sumario']['surface_raw']}' @{r['sumario']['span']['start']}..{r['sumario']['span']['end']}")
-        print(f"  body   : '{r['body']['surface_raw']}' @{r['body']['span']['start']}..{r['body']['span']['end']}")
-        print(f"  conf   : {r['confidence']}")
-
-    # Diagnostics
-    diag = payload["diagnostics"]
-    if diag.get("split_anchor") or diag.get("unmatched_sumario_orgs") or diag.get("unmatched_body_orgs"):
-        print("\n=== DIAGNOSTICS ===")
-        if diag.get("split_anchor"):
-            print(f"Split anchor: {diag['split_anchor']}")
-        if diag.get("unmatched_sumario_orgs"):
-            print("Unmatched Sumário ORGs:")
-            for h in diag["unmatched_sumario_orgs"]:
-                print(f"  - '{h['surface_raw']}' @{h['span']['start']}..{h['span']['end']} | key={h['canonical_key']}")
-        if diag.get("unmatched_body_orgs"):
-            print("Unmatched Body ORGs:")
-            for h in diag["unmatched_body_orgs"]:
-                print(f"  - '{h['surface_raw']}' @{h['span']['start']}..{h['span']['end']} | key={h['canonical_key']}")
-
-    # Optional: also run the pipeline on _text_01
-    payload2, _, _, _ = parse_sumario_and_body_bundle(_text_01, nlp)
-    print("\n=== SECOND SAMPLE (quick check) ===")
-    print(f"Strategy: {payload2['diagnostics']['strategy']}, "
-          f"Sumário len={payload2['sumario']['span']['end']-payload2['sumario']['span']['start']}, "
-          f"Body len={payload2['body']['span']['end']-payload2['body']['span']['start']}")
+    # Concise console summary, written in one go
+    sys.stdout.write("\n".join(format_bundle_summary(payload)) + "\n")
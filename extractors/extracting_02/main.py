@@ -1,7 +1,7 @@
 # main.py
 import sys
 import json
-from entities import nlp, parse_sumario_and_body_bundle
+from entities import nlp, parse_sumario_and_body_bundle, format_bundle_summary
 
 def run_pipeline(text_raw: str):
     """
@@ -125,54 +125,8 @@ SECRETARIAREGIONAL DOS RECURSOS HUMANOS
     # 2) Run the full pipeline
     payload, sumario_text, body_text, full_text = run_pipeline(text_raw)
 
-    # 3) Concise console summary
-    sum_span = payload["sumario"]["span"]
-    body_span = payload["body"]["span"]
-    print("\n=== SPLIT ===")
-    print(f"Sumário: {sum_span['start']}..{sum_span['end']} | len={sum_span['end']-sum_span['start']}")
-    print(f"Body   : {body_span['start']}..{body_span['end']} | len={body_span['end']-body_span['start']}")
-    print(f"Strategy: {payload['diagnostics']['strategy']}")
-
-    # Sections & items
-    print("\n=== SUMÁRIO SECTIONS ===")
-    for s in payload["sumario"]["sections"]:
-        path = " > ".join(s["path"])
-        print(f"- {path}  @ {s['span']['start']}..{s['span']['end']}")
-        for it in s["items"]:
-            print(f"    • {it['text']}  @ {it['span']['start']}..{it['span']['end']}")
-
-    # Section → Item relations
-    print("\n=== SUMÁRIO RELATIONS (Section → Item) ===")
-    for r in payload["sumario"]["relations_section_item"]:
-        print(f"{' > '.join(r['section_path'])}  ::  {r['item_text']}")
-
-    # (Optional) Section ranges
-    print("\n=== SUMÁRIO SECTION RANGES ===")
-    for sr in payload["sumario"]["section_ranges"]:
-        print(f"{' > '.join(sr['section_path'])}  ::  content {sr['content_range']['start']}..{sr['content_range']['end']}")
-
-    # ORG → ORG relations
-    print("\n=== ORG → ORG RELATIONS ===")
-    for r in payload["relations_org_to_org"]:
-        print(f"- {r['key']}")
-        print(f"  sumário: '{r['sumario']['surface_raw']}' @{r['sumario']['span']['start']}..{r['sumario']['span']['end']}")
-        print(f"  body   : '{r['body']['surface_raw']}' @{r['body']['span']['start']}..{r['body']['span']['end']}")
-        print(f"  conf   : {r['confidence']}")
-
-    # Diagnostics
-    diag = payload["diagnostics"]
-    if diag.get("unmatched_sumario_orgs") or diag.get("unmatched_body_orgs") or diag.get("split_anchor"):
-        print("\n=== DIAGNOSTICS ===")
-        if diag.get("split_anchor"):
-            print(f"Split anchor: {diag['split_anchor']}")
-        if diag.get("unmatched_sumario_orgs"):
-            print("Unmatched Sumário ORGs:")
-            for h in diag["unmatched_sumario_orgs"]:
-                print(f"  - '{h['surface_raw']}' @{h['span']['start']}..{h['span']['end']} | key={h['canonical_key']}")
-        if diag.get("unmatched_body_orgs"):
-            print("Unmatched Body ORGs:")
-            for h in diag["unmatched_body_orgs"]:
-                print(f"  - '{h['surface_raw']}' @{h['span']['start']}..{h['span']['end']} | key={h['canonical_key']}")
+    # 3) Concise console summary (one write instead of a print per line)
+    sys.stdout.write("\n".join(format_bundle_summary(payload)) + "\n")
 
     # 4) Optional: write payload JSON for inspection
     out_path = "sumario_body_payload.json"